@@ -69,7 +69,8 @@ class SetupMesh(Step):
         check_call(args, logger)
 
         make_graph_file(mesh_filename='landice_grid.nc',
-                        graph_filename='graph.info')
+                        graph_filename='graph.info',
+                        logger=logger)
 
         _setup_circular_shelf_initial_conditions(config, logger,
                                                  filename='landice_grid.nc')
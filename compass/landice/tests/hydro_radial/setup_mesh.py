@@ -82,7 +82,8 @@ class SetupMesh(Step):
         check_call(args, logger)
 
         make_graph_file(mesh_filename='landice_grid.nc',
-                        graph_filename='graph.info')
+                        graph_filename='graph.info',
+                        logger=logger)
 
         _setup_hydro_radial_initial_conditions(
             logger, filename='landice_grid.nc',
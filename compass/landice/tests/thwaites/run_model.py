@@ -90,7 +90,8 @@ class RunModel(Step):
         Run this step of the test case
         """
         make_graph_file(mesh_filename=self.mesh_file,
-                        graph_filename='graph.info')
+                        graph_filename='graph.info',
+                        logger=self.logger)
         for suffix in self.suffixes:
             run_model(step=self, namelist='namelist.{}'.format(suffix),
                       streams='streams.{}'.format(suffix))
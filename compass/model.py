@@ -1,7 +1,9 @@
 import os
+import shlex
+import numpy
 import xarray
 
-from mpas_tools.logging import check_call
+from mpas_tools.logging import check_call, LoggingContext
 
 
 def run_model(step, update_pio=True, partition_graph=True,
@@ -53,18 +55,43 @@ def run_model(step, update_pio=True, partition_graph=True,
 
     os.environ['OMP_NUM_THREADS'] = '{}'.format(threads)
 
+    if config.has_option('parallel', 'bind_policy'):
+        bind_policy = config.get('parallel', 'bind_policy')
+    else:
+        bind_policy = 'none'
+    if bind_policy not in ['none', 'close', 'spread']:
+        raise ValueError('Unexpected bind_policy {} in the [parallel] config '
+                         'section, should be none, close or spread'.format(
+                             bind_policy))
+    bind_env = dict()
+    if bind_policy != 'none':
+        # keep threads from migrating between cores (and NUMA domains), but
+        # don't override the user's own affinity settings
+        for var, value in [('OMP_PROC_BIND', bind_policy),
+                           ('OMP_PLACES', 'cores')]:
+            if var not in os.environ:
+                bind_env[var] = value
+
     parallel_executable = config.get('parallel', 'parallel_executable')
     model = config.get('executables', 'model')
     model_basename = os.path.basename(model)
 
-    # split the parallel executable into constituents in case it includes flags
-    args = parallel_executable.split(' ')
+    # split the parallel executable into constituents in case it includes
+    # flags, respecting any quoting and repeated whitespace
+    args = shlex.split(parallel_executable)
     args.extend(['-n', '{}'.format(cores),
                  './{}'.format(model_basename),
                  '-n', namelist,
                  '-s', streams])
 
-    check_call(args, logger)
+    # only set the binding for this launch, so it doesn't carry over to test
+    # cases run later in the same process
+    os.environ.update(bind_env)
+    try:
+        check_call(args, logger)
+    finally:
+        for var in bind_env:
+            os.environ.pop(var, None)
 
 
 def partition(cores, config, logger, graph_file='graph.info'):
@@ -94,7 +121,8 @@ def partition(cores, config, logger, graph_file='graph.info'):
 
 
 def make_graph_file(mesh_filename, graph_filename='graph.info',
-                    weight_field=None):
+                    weight_field=None, chunk_size=2**17, force=False,
+                    logger=None):
     """
     Make a graph file from the MPAS mesh for use in the Metis graph
     partitioning software
@@ -110,45 +138,138 @@ def make_graph_file(mesh_filename, graph_filename='graph.info',
     weight_field : str
         The name of a variable in the MPAS mesh file to use as a field of
         weights
+
+    chunk_size : int, optional
+        The number of cells to read from the mesh file at a time, which
+        limits the memory needed for very large meshes
+
+    force : bool, optional
+        Whether to make the graph file even if one already exists that is
+        newer than the mesh file and matches its number of cells and the
+        use of weights (e.g. when the test case is being rerun)
+
+    logger : logging.Logger, optional
+        A logger for the output if not stdout
     """
+    if not force and _graph_file_is_current(mesh_filename, graph_filename,
+                                            weight_field):
+        with LoggingContext(name=__name__, logger=logger) as logger:
+            logger.info('Reusing existing graph file {}'.format(
+                graph_filename))
+        return
 
     with xarray.open_dataset(mesh_filename) as ds:
 
         nCells = ds.sizes['nCells']
 
-        nEdgesOnCell = ds.nEdgesOnCell.values
-        cellsOnCell = ds.cellsOnCell.values - 1
-        if weight_field is not None:
-            if weight_field in ds:
-                raise ValueError('weight_field {} not found in {}'.format(
-                    weight_field, mesh_filename))
-            weights = ds[weight_field].values
-        else:
-            weights = None
-
-    nEdges = 0
-    for i in range(nCells):
-        for j in range(nEdgesOnCell[i]):
-            if cellsOnCell[i][j] != -1:
-                nEdges = nEdges + 1
-
-    nEdges = nEdges/2
-
-    with open(graph_filename, 'w+') as graph:
-        if weights is None:
-            graph.write('{} {}\n'.format(nCells, nEdges))
-
-            for i in range(nCells):
-                for j in range(0, nEdgesOnCell[i]):
-                    if cellsOnCell[i][j] >= 0:
-                        graph.write('{} '.format(cellsOnCell[i][j]+1))
-                graph.write('\n')
-        else:
-            graph.write('{} {} 010\n'.format(nCells, nEdges))
-
-            for i in range(nCells):
-                graph.write('{} '.format(int(weights[i])))
-                for j in range(0, nEdgesOnCell[i]):
-                    if cellsOnCell[i][j] >= 0:
-                        graph.write('{} '.format(cellsOnCell[i][j] + 1))
-                graph.write('\n')
+        if weight_field is not None and weight_field not in ds:
+            raise ValueError('weight_field {} not found in {}'.format(
+                weight_field, mesh_filename))
+
+        chunks = [slice(start, min(start + chunk_size, nCells)) for start in
+                  range(0, nCells, chunk_size)]
+
+        # first pass: count the edges so we can write the header
+        nEdges = 0
+        for chunk in chunks:
+            _, valid = _get_cell_neighbors(ds, chunk)
+            nEdges += int(numpy.count_nonzero(valid))
+
+        # each edge is shared by two cells
+        nEdges = nEdges // 2
+
+        # second pass: write the neighbors of each cell.  The file is pure
+        # ASCII, so we write bytes and encode each chunk's text only once.
+        # We write to a temporary file and only move it into place once it
+        # is complete, so a run that is killed partway through doesn't leave
+        # behind a partial graph file that would be reused on a rerun
+        tmp_filename = '{}.tmp'.format(graph_filename)
+        with open(tmp_filename, 'wb', buffering=2**20) as graph:
+            if weight_field is None:
+                header = '{} {}\n'.format(nCells, nEdges)
+            else:
+                header = '{} {} 010\n'.format(nCells, nEdges)
+            graph.write(header.encode('ascii'))
+
+            for chunk in chunks:
+                cellsOnCell, valid = _get_cell_neighbors(ds, chunk)
+
+                # formatting python ints is much faster than numpy scalars,
+                # so convert the one-based neighbors (with zeros for invalid
+                # entries) to nested lists once for the whole chunk
+                neighbors = numpy.where(valid, cellsOnCell + 1, 0).tolist()
+
+                if weight_field is None:
+                    lines = [' '.join([str(cell) for cell in row if cell > 0])
+                             for row in neighbors]
+                else:
+                    weights = ds[weight_field].isel(
+                        nCells=chunk).values.astype(int).tolist()
+                    lines = ['{} {}'.format(weight, ' '.join(
+                        [str(cell) for cell in row if cell > 0]))
+                        for weight, row in zip(weights, neighbors)]
+                lines.append('')
+                graph.write('\n'.join(lines).encode('ascii'))
+
+        os.replace(tmp_filename, graph_filename)
+
+
+def _graph_file_is_current(mesh_filename, graph_filename, weight_field):
+    """
+    Whether an existing graph file is newer than the mesh file (and the
+    symlink to it, if any) and has the header and number of lines that would
+    be written for it
+    """
+    if not os.path.exists(graph_filename):
+        return False
+
+    # a symlink that now points to a different (possibly older) mesh file is
+    # newer than the graph file itself
+    mesh_mtime = max(os.path.getmtime(mesh_filename),
+                     os.lstat(mesh_filename).st_mtime)
+    if os.path.getmtime(graph_filename) < mesh_mtime:
+        return False
+
+    with open(graph_filename) as graph:
+        header = graph.readline().split()
+
+    with xarray.open_dataset(mesh_filename) as ds:
+        nCells = ds.sizes['nCells']
+
+    if weight_field is None:
+        flags = []
+    else:
+        flags = ['010']
+
+    if len(header) < 2 or header[0] != '{}'.format(nCells) or \
+            header[2:] != flags:
+        return False
+
+    # a complete graph file has the header and one line per cell, so this
+    # catches a file that was truncated (e.g. by an older compass that was
+    # killed while writing it)
+    line_count = 0
+    with open(graph_filename, 'rb') as graph:
+        for block in iter(lambda: graph.read(2**20), b''):
+            line_count += block.count(b'\n')
+
+    return line_count == nCells + 1
+
+
+def _get_cell_neighbors(ds, chunk):
+    """
+    Read the zero-based neighbors of a contiguous range of cells and a mask
+    of which of them are valid
+    """
+    ds = ds.isel(nCells=chunk)
+    nEdgesOnCell = ds.nEdgesOnCell.values
+    cellsOnCell = ds.cellsOnCell.values - 1
+
+    # only the first nEdgesOnCell entries of each row are valid neighbors
+    maxEdges = cellsOnCell.shape[1]
+    valid = numpy.logical_and(
+        numpy.arange(maxEdges)[numpy.newaxis, :] <
+        nEdgesOnCell[:, numpy.newaxis],
+        cellsOnCell >= 0)
+
+    return cellsOnCell, valid
@@ -1,3 +1,4 @@
+import math
 import numpy
 import xarray
 import shutil
@@ -33,9 +34,18 @@ def compute_land_ice_pressure_and_draft(ssh, modify_mask, ref_density):
         The ice draft, equal to the initial ``ssh``
     """
     gravity = constants['SHR_CONST_G']
-    landIcePressure = \
-        modify_mask*numpy.maximum(-ref_density * gravity * ssh, 0.)
     landIceDraft = ssh
+
+    # broadcasting produces views, so the scaled ssh is the only full-size
+    # array we allocate, and the clipping and masking are done in place
+    modify_mask, ssh = xarray.broadcast(modify_mask, ssh)
+    # do the arithmetic in the precision of ssh (e.g. single precision)
+    # even if ref_density is a double-precision numpy scalar
+    scale = ssh.dtype.type(-ref_density * gravity)
+    landIcePressure = scale * ssh
+    pressure = landIcePressure.values
+    numpy.maximum(pressure, 0., out=pressure)
+    numpy.multiply(pressure, modify_mask.values, out=pressure)
     return landIcePressure, landIceDraft
 
 
@@ -92,20 +102,29 @@ def adjust_ssh(variable, iteration_count, step):
 
             initSSH = ds.ssh
             if 'minLevelCell' in ds:
-                minLevelCell = ds.minLevelCell-1
+                minLevelCell = ds.minLevelCell.values - 1
             else:
-                minLevelCell = xarray.zeros_like(ds.maxLevelCell)
+                minLevelCell = numpy.zeros(ds.sizes['nCells'], dtype=int)
 
             with xarray.open_dataset('output_ssh.nc') as ds_ssh:
                 # get the last time entry
                 ds_ssh = ds_ssh.isel(Time=ds_ssh.sizes['Time'] - 1)
                 finalSSH = ds_ssh.ssh
-                topDensity = ds_ssh.density.isel(nVertLevels=minLevelCell)
-
-            mask = numpy.logical_and(ds.maxLevelCell > 0,
-                                     ds.modifyLandIcePressureMask == 1)
-
-            deltaSSH = mask * (finalSSH - initSSH)
+                if variable == 'landIcePressure':
+                    # only read the levels down to the deepest top level,
+                    # rather than the full 3D density field, then pick out
+                    # the top level in each cell
+                    density = ds_ssh.density.isel(
+                        nVertLevels=slice(0, minLevelCell.max() + 1)).values
+                    topDensity = density[numpy.arange(len(minLevelCell)),
+                                         minLevelCell]
+
+            # these are simple reductions over cells, so work with numpy
+            # arrays rather than building up xarray intermediates
+            mask = numpy.logical_and(ds.maxLevelCell.values > 0,
+                                     ds.modifyLandIcePressureMask.values == 1)
+
+            deltaSSH = numpy.where(mask, finalSSH.values - initSSH.values, 0.)
 
             # then, modify the SSH or land-ice pressure
             if variable == 'ssh':
@@ -116,10 +135,17 @@ def adjust_ssh(variable, iteration_count, step):
                 # computing sea-surface tilt
                 ds_out['landIceDraft'] = ssh
                 # we also need to stretch layerThickness to be compatible with
-                # the new SSH
-                stretch = ((finalSSH + ds.bottomDepth) /
-                           (initSSH + ds.bottomDepth))
-                ds_out['layerThickness'] = ds_out.layerThickness * stretch
+                # the new SSH (only needed in cells where the SSH changed)
+                changed = numpy.flatnonzero(finalSSH.values != initSSH.values)
+                if len(changed) > 0:
+                    bottomDepth = ds.bottomDepth.values[changed]
+                    stretch = ((finalSSH.values[changed] + bottomDepth) /
+                               (initSSH.values[changed] + bottomDepth))
+                    layerThickness = numpy.array(ds_out.layerThickness.values)
+                    layerThickness[:, changed, :] *= \
+                        stretch[numpy.newaxis, :, numpy.newaxis]
+                    ds_out['layerThickness'] = \
+                        ds_out.layerThickness.copy(data=layerThickness)
                 landIcePressure = ds.landIcePressure.values
             else:
                 # Moving the SSH up or down by deltaSSH would change the
@@ -136,6 +162,7 @@ def adjust_ssh(variable, iteration_count, step):
 
                 ds_out['landIcePressure'] = \
                     landIcePressure.expand_dims(dim='Time', axis=0)
+                landIcePressure = landIcePressure.values
 
                 finalSSH = initSSH
 
@@ -145,26 +172,25 @@ def adjust_ssh(variable, iteration_count, step):
             with open('maxDeltaSSH_{:03d}.log'.format(iterIndex), 'w') as \
                     log_file:
 
-                mask = landIcePressure > 0.
-                iCell = numpy.abs(deltaSSH.where(mask)).argmax().values
-
-                ds_cell = ds.isel(nCells=iCell)
+                # the largest change among cells under land ice
+                iCell = numpy.argmax(numpy.where(landIcePressure > 0.,
+                                                 numpy.abs(deltaSSH), -1.))
 
                 if on_a_sphere:
                     coords = 'lon/lat: {:f} {:f}'.format(
-                        numpy.rad2deg(ds_cell.lonCell.values),
-                        numpy.rad2deg(ds_cell.latCell.values))
+                        math.degrees(ds.lonCell.values[iCell]),
+                        math.degrees(ds.latCell.values[iCell]))
                 else:
                     coords = 'x/y: {:f} {:f}'.format(
-                        1e-3 * ds_cell.xCell.values,
-                        1e-3 * ds_cell.yCell.values)
-                string = 'deltaSSHMax: {:g}, {}'.format(
-                    deltaSSH.isel(nCells=iCell).values, coords)
+                        1e-3 * ds.xCell.values[iCell],
+                        1e-3 * ds.yCell.values[iCell])
+                string = 'deltaSSHMax: {:g}, {}'.format(deltaSSH[iCell],
+                                                        coords)
                 logger.info('     {}'.format(string))
                 log_file.write('{}\n'.format(string))
                 string = 'ssh: {:g}, landIcePressure: {:g}'.format(
-                    finalSSH.isel(nCells=iCell).values,
-                    landIcePressure.isel(nCells=iCell).values)
+                    finalSSH.values[iCell],
+                    landIcePressure[iCell])
                 logger.info('     {}'.format(string))
                 log_file.write('{}\n'.format(string))
 
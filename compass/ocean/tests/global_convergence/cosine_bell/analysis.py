@@ -30,15 +30,16 @@ class Analysis(Step):
         self.resolutions = resolutions
 
         for resolution in resolutions:
+            mesh_name = 'QU{}'.format(resolution)
             self.add_input_file(
-                filename='QU{}_namelist.ocean'.format(resolution),
-                target='../QU{}/init/namelist.ocean'.format(resolution))
+                filename='{}_namelist.ocean'.format(mesh_name),
+                target='../{}/init/namelist.ocean'.format(mesh_name))
             self.add_input_file(
-                filename='QU{}_init.nc'.format(resolution),
-                target='../QU{}/init/initial_state.nc'.format(resolution))
+                filename='{}_init.nc'.format(mesh_name),
+                target='../{}/init/initial_state.nc'.format(mesh_name))
             self.add_input_file(
-                filename='QU{}_output.nc'.format(resolution),
-                target='../QU{}/forward/output.nc'.format(resolution))
+                filename='{}_output.nc'.format(mesh_name),
+                target='../{}/forward/output.nc'.format(mesh_name))
 
         self.add_output_file('convergence.png')
 
@@ -99,15 +100,16 @@ class Analysis(Step):
         init = xr.open_dataset('{}_init.nc'.format(resTag))
         # find time since the beginning of run
         ds = xr.open_dataset('{}_output.nc'.format(resTag))
-        for j in range(len(ds.xtime)):
-            tt = str(ds.xtime[j].values)
-            tt.rfind('_')
-            DY = float(tt[10:12]) - 1
+        # read all the times at once, rather than indexing xtime for each
+        xtime = ds.xtime.values
+        for j in range(len(xtime)):
+            tt = xtime[j].decode('utf-8')
+            DY = float(tt[8:10]) - 1
             if DY == pd:
                 sliceTime = j
                 break
-        HR = float(tt[13:15])
-        MN = float(tt[16:18])
+        HR = float(tt[11:13])
+        MN = float(tt[14:16])
         t = 86400.0 * DY + HR * 3600. + MN
         # find new location of blob center
         # center is based on equatorial velocity
@@ -120,7 +122,7 @@ class Analysis(Step):
             newLon -= 2.0 * np.pi
 
         # construct analytic tracer
-        tracer = np.zeros_like(init.tracer1[0, :, 0].values)
+        tracer = np.zeros(init.sizes['nCells'])
         latC = init.latCell.values
         lonC = init.lonCell.values
         temp = R * np.arccos(np.sin(latCent) * np.sin(latC) +
@@ -1,5 +1,3 @@
-import time
-
 from compass.model import run_model
 from compass.step import Step
 
@@ -82,7 +80,7 @@ class Forward(Step):
         dt_per_km = config.getint('cosine_bell', 'dt_per_km')
 
         dt = dt_per_km * self.resolution
-        # https://stackoverflow.com/a/1384565/7728169
-        dt = time.strftime('%H:%M:%S', time.gmtime(dt))
+        dt = '{:02d}:{:02d}:{:02d}'.format(dt // 3600, (dt % 3600) // 60,
+                                           dt % 60)
 
         return dt
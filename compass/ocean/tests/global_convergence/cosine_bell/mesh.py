@@ -50,7 +50,8 @@ class Mesh(Step):
                              logger=logger, use_progress_bar=use_progress_bar)
 
         make_graph_file(mesh_filename='mesh.nc',
-                        graph_filename='graph.info')
+                        graph_filename='graph.info',
+                        logger=logger)
 
     def build_cell_width_lat_lon(self):
         """
@@ -1,3 +1,4 @@
+import numpy
 import xarray
 
 from mpas_tools.planar_hex import make_planar_hex_mesh
@@ -77,44 +78,50 @@ class InitialState(Step):
         d2 = d1 + section.getfloat('slope_height')
         d3 = bottom_depth
 
-        ds = dsMesh.copy()
+        ds = dsMesh
 
-        ds['bottomDepth'] = bottom_depth * xarray.ones_like(ds.xCell)
+        ds['bottomDepth'] = xarray.full_like(ds.xCell, bottom_depth)
 
         yCell = ds.yCell
 
-        column_thickness = xarray.where(
-            yCell < y1, d1, d1 + (d2 - d1) * (yCell - y1) / (y2 - y1))
-        column_thickness = xarray.where(
-            yCell < y2, column_thickness,
-            d2 + (d3 - d2) * (yCell - y2) / (y3 - y2))
-        column_thickness = xarray.where(yCell < y3, column_thickness, d3)
+        # compute the piecewise-linear column thickness in a single pass
+        y = yCell.values
+        under_ice = y < y3
+        column_thickness = numpy.piecewise(
+            y, [y < y1, numpy.logical_and(y >= y1, y < y2),
+                numpy.logical_and(y >= y2, under_ice)],
+            [d1, lambda v: d1 + (d2 - d1) * (v - y1) / (y2 - y1),
+             lambda v: d2 + (d3 - d2) * (v - y2) / (y3 - y2), d3])
+        column_thickness = xarray.DataArray(column_thickness, dims=yCell.dims,
+                                            coords=yCell.coords)
 
         ds['ssh'] = -bottom_depth + column_thickness
 
         # set up the vertical coordinate
         init_vertical_coord(config, ds)
 
-        modify_mask = xarray.where(yCell < y3, 1, 0).expand_dims(
-            dim='Time', axis=0)
+        # MPAS masks are 32-bit integers
+        modify_mask = xarray.DataArray(
+            under_ice.astype(numpy.int32), dims=yCell.dims,
+            coords=yCell.coords).expand_dims(dim='Time', axis=0)
         landIceFraction = modify_mask.astype(float)
-        landIceMask = modify_mask.copy()
+        landIceMask = modify_mask
 
         ref_density = constants['SHR_CONST_RHOSW']
         landIcePressure, landIceDraft = compute_land_ice_pressure_and_draft(
             ssh=ds.ssh, modify_mask=modify_mask, ref_density=ref_density)
 
+        # zMid already has the dimensions of layerThickness
         salinity = surface_salinity + ((bottom_salinity - surface_salinity) *
                                        (ds.zMid / (-bottom_depth)))
-        salinity, _ = xarray.broadcast(salinity, ds.layerThickness)
-        salinity = salinity.transpose('Time', 'nCells', 'nVertLevels')
 
-        normalVelocity = xarray.zeros_like(ds.xEdge)
-        normalVelocity, _ = xarray.broadcast(normalVelocity, ds.refBottomDepth)
-        normalVelocity = normalVelocity.transpose('nEdges', 'nVertLevels')
-        normalVelocity = normalVelocity.expand_dims(dim='Time', axis=0)
+        # a zero-copy view, since the velocity is zero everywhere
+        normalVelocity = xarray.DataArray(
+            numpy.broadcast_to(0., (1, ds.sizes['nEdges'],
+                                    ds.sizes['nVertLevels'])),
+            dims=('Time', 'nEdges', 'nVertLevels'))
 
-        ds['temperature'] = temperature * xarray.ones_like(ds.layerThickness)
+        ds['temperature'] = xarray.full_like(ds.layerThickness, temperature)
         ds['salinity'] = salinity
         ds['normalVelocity'] = normalVelocity
         ds['fCell'] = xarray.zeros_like(ds.xCell)
@@ -1,7 +1,7 @@
 import os
 import shutil
 import xarray
-import time
+from functools import lru_cache
 
 from compass.model import run_model
 from compass.step import Step
@@ -150,6 +150,18 @@ def get_time_steps(resolution):
     options : dict
         A dictionary with replacements for ``config_dt`` and ``config_brt_dt``
     """
+    # a new dictionary each time, since callers add their own options to it
+    dt, btr_dt = _get_time_step_strings(resolution)
+    return dict(config_dt="'{}'".format(dt),
+                config_btr_dt="'{}'".format(btr_dt))
+
+
+@lru_cache()
+def _get_time_step_strings(resolution):
+    """
+    Get the baroclinic and barotropic time steps for the resolution as
+    HH:MM:SS strings, computed once per resolution
+    """
 
     # 4 minutes at 2 km, and proportional to resolution
     dt = 2.*60*resolution
@@ -157,11 +169,18 @@ def get_time_steps(resolution):
     # 10 sec at 2 km, and proportional to resolution
     btr_dt = 5.*resolution
 
-    # https://stackoverflow.com/a/1384565/7728169
     # Note: this will drop any fractional seconds, which is usually okay
-    dt = time.strftime('%H:%M:%S', time.gmtime(dt))
+    dt = _format_time(dt)
 
-    btr_dt = time.strftime('%H:%M:%S', time.gmtime(btr_dt))
+    btr_dt = _format_time(btr_dt)
 
-    return dict(config_dt="'{}'".format(dt),
-                config_btr_dt="'{}'".format(btr_dt))
+    return dt, btr_dt
+
+
+def _format_time(seconds):
+    """
+    Format a number of seconds as HH:MM:SS, dropping any fractional seconds
+    """
+    seconds = int(seconds)
+    return '{:02d}:{:02d}:{:02d}'.format(seconds // 3600,
+                                         (seconds // 60) % 60, seconds % 60)
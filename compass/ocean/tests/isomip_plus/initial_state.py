@@ -161,14 +161,15 @@ class InitialState(Step):
         # compute coriolis
         coriolis_parameter = section.getfloat('coriolis_parameter')
 
-        ds['fCell'] = coriolis_parameter*xarray.ones_like(ds.xCell)
-        ds['fEdge'] = coriolis_parameter*xarray.ones_like(ds.xEdge)
-        ds['fVertex'] = coriolis_parameter*xarray.ones_like(ds.xVertex)
-
-        normalVelocity = xarray.zeros_like(ds.xEdge)
-        normalVelocity = normalVelocity.broadcast_like(ds.refBottomDepth)
-        normalVelocity = normalVelocity.transpose('nEdges', 'nVertLevels')
-        ds['normalVelocity'] = normalVelocity.expand_dims(dim='Time', axis=0)
+        ds['fCell'] = xarray.full_like(ds.xCell, coriolis_parameter)
+        ds['fEdge'] = xarray.full_like(ds.xEdge, coriolis_parameter)
+        ds['fVertex'] = xarray.full_like(ds.xVertex, coriolis_parameter)
+
+        # a zero-copy view, since the velocity is zero everywhere
+        ds['normalVelocity'] = xarray.DataArray(
+            numpy.broadcast_to(0., (1, ds.sizes['nEdges'],
+                                    ds.sizes['nVertLevels'])),
+            dims=('Time', 'nEdges', 'nVertLevels'))
 
         write_netcdf(ds, 'initial_state.nc')
 
@@ -131,15 +131,19 @@ def _compute_zmid_from_layer_thickness(layerThickness, ssh, cellMask):
         The elevation of layer centers
     """
 
-    zTop = ssh.copy()
+    dims = ('Time', 'nCells', 'nVertLevels')
+    # loop over levels with numpy arrays rather than xarray objects, keeping
+    # the same order of operations
+    thickness = layerThickness.transpose(*dims).values
+    mask = cellMask.transpose('nCells', 'nVertLevels').values
+    zTop = ssh.transpose('Time', 'nCells').values.copy()
     nVertLevels = layerThickness.sizes['nVertLevels']
-    zMid = []
+    zMid = numpy.zeros(thickness.shape)
     for zIndex in range(nVertLevels):
-        mask = cellMask.isel(nVertLevels=zIndex)
-        thickness = layerThickness.isel(nVertLevels=zIndex).where(mask, 0.)
-        z = (zTop - 0.5*thickness).where(mask)
-        zMid.append(z)
-        zTop -= thickness
-    zMid = xarray.concat(zMid, dim='nVertLevels').transpose('Time', 'nCells',
-                                                            'nVertLevels')
+        levelMask = mask[:, zIndex]
+        levelThickness = numpy.where(levelMask, thickness[:, :, zIndex], 0.)
+        zMid[:, :, zIndex] = numpy.where(levelMask,
+                                         zTop - 0.5*levelThickness, numpy.nan)
+        zTop -= levelThickness
+    zMid = xarray.DataArray(zMid, dims=dims)
     return zMid
@@ -1,6 +1,7 @@
 import os
 import multiprocessing
 import subprocess
+from functools import lru_cache
 
 
 def get_available_cores_and_nodes(config):
@@ -24,10 +25,7 @@ def get_available_cores_and_nodes(config):
     parallel_system = config.get('parallel', 'system')
     if parallel_system == 'slurm':
         job_id = os.environ['SLURM_JOB_ID']
-        args = ['squeue', '--noheader', '-j', job_id, '-o', '%C']
-        cores = _get_subprocess_int(args)
-        args = ['squeue', '--noheader', '-j', job_id, '-o', '%D']
-        nodes = _get_subprocess_int(args)
+        cores, nodes = _get_slurm_cores_and_nodes(job_id)
     elif parallel_system == 'single_node':
         cores_per_node = config.getint('parallel', 'cores_per_node')
         cores = min(multiprocessing.cpu_count(), cores_per_node)
@@ -39,7 +37,11 @@ def get_available_cores_and_nodes(config):
     return cores, nodes
 
 
-def _get_subprocess_int(args):
+@lru_cache()
+def _get_slurm_cores_and_nodes(job_id):
+    # the resources allocated to a job don't change, so we only need to ask
+    # squeue once per job, rather than once per step
+    args = ['squeue', '--noheader', '-j', job_id, '-o', '%C %D']
     value = subprocess.check_output(args)
-    value = int(value.decode('utf-8').strip('\n'))
-    return value
+    cores, nodes = [int(entry) for entry in value.decode('utf-8').split()]
+    return cores, nodes
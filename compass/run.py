@@ -4,12 +4,21 @@ import os
 import pickle
 import configparser
 import time
-import glob
 
 from mpas_tools.logging import LoggingContext
 import mpas_tools.io
 
 
+# ANSI fail text: https://stackoverflow.com/a/287944/7728169
+_START_FAIL = '\033[91m'
+_START_PASS = '\033[92m'
+_END = '\033[0m'
+_PASS_STR = '{}PASS{}'.format(_START_PASS, _END)
+_SUCCESS_STR = '{}SUCCESS{}'.format(_START_PASS, _END)
+_FAIL_STR = '{}FAIL{}'.format(_START_FAIL, _END)
+_ERROR_STR = '{}ERROR{}'.format(_START_FAIL, _END)
+
+
 def run_suite(suite_name):
     """
     Run the given test suite
@@ -19,15 +28,6 @@ def run_suite(suite_name):
     suite_name : str
         The name of the test suite
     """
-    # ANSI fail text: https://stackoverflow.com/a/287944/7728169
-    start_fail = '\033[91m'
-    start_pass = '\033[92m'
-    end = '\033[0m'
-    pass_str = '{}PASS{}'.format(start_pass, end)
-    success_str = '{}SUCCESS{}'.format(start_pass, end)
-    fail_str = '{}FAIL{}'.format(start_fail, end)
-    error_str = '{}ERROR{}'.format(start_fail, end)
-
     # Allow a suite name to either include or not the .pickle suffix
     if suite_name.endswith('.pickle'):
         # code below assumes no suffix, so remove it
@@ -37,7 +37,7 @@ def run_suite(suite_name):
         raise ValueError('The suite "{}" doesn\'t appear to have been set up '
                          'here.'.format(suite_name))
     with open('{}.pickle'.format(suite_name), 'rb') as handle:
-        test_suite = pickle.load(handle)
+        test_suite = pickle.loads(handle.read())
 
     # start logging to stdout/stderr
     with LoggingContext(suite_name) as logger:
@@ -51,7 +51,7 @@ def run_suite(suite_name):
 
         failures = 0
         cwd = os.getcwd()
-        suite_start = time.time()
+        suite_start = time.monotonic()
         test_times = dict()
         success = dict()
         for test_name in test_suite['test_cases']:
@@ -69,24 +69,19 @@ def run_suite(suite_name):
 
                 os.chdir(test_case.work_dir)
 
-                config = configparser.ConfigParser(
-                    interpolation=configparser.ExtendedInterpolation())
-                config.read(test_case.config_filename)
+                config = _read_config(test_case.config_filename)
                 test_case.config = config
 
-                mpas_tools.io.default_format = config.get('io', 'format')
-                mpas_tools.io.default_engine = config.get('io', 'engine')
-
                 test_case.steps_to_run = config.get(
                     'test_case', 'steps_to_run').replace(',', ' ').split()
 
-                test_start = time.time()
+                test_start = time.monotonic()
                 try:
                     test_case.run()
-                    run_status = success_str
+                    run_status = _SUCCESS_STR
                     test_pass = True
                 except BaseException:
-                    run_status = error_str
+                    run_status = _ERROR_STR
                     test_pass = False
                     test_logger.exception('Exception raised in run()')
 
@@ -94,7 +89,7 @@ def run_suite(suite_name):
                     try:
                         test_case.validate()
                     except BaseException:
-                        run_status = error_str
+                        run_status = _ERROR_STR
                         test_pass = False
                         test_logger.exception('Exception raised in validate()')
 
@@ -106,56 +101,55 @@ def run_suite(suite_name):
 
                     if internal_pass is not None:
                         if internal_pass:
-                            internal_status = pass_str
+                            internal_status = _PASS_STR
                         else:
-                            internal_status = fail_str
-                            test_logger.exception(
+                            internal_status = _FAIL_STR
+                            test_logger.error(
                                 'Internal test case validation failed')
                             test_pass = False
 
                     if baseline_pass is not None:
                         if baseline_pass:
-                            baseline_status = pass_str
+                            baseline_status = _PASS_STR
                         else:
-                            baseline_status = fail_str
-                            test_logger.exception('Baseline validation failed')
+                            baseline_status = _FAIL_STR
+                            test_logger.error('Baseline validation failed')
                             test_pass = False
 
-                status = '  test execution:      {}'.format(run_status)
+                status = ['  test execution:      {}'.format(run_status)]
                 if internal_status is not None:
-                    status = '{}\n  test validation:     {}'.format(
-                        status, internal_status)
+                    status.append(
+                        '  test validation:     {}'.format(internal_status))
                 if baseline_status is not None:
-                    status = '{}\n  baseline comparison: {}'.format(
-                        status, baseline_status)
+                    status.append(
+                        '  baseline comparison: {}'.format(baseline_status))
+                status = '\n'.join(status)
 
                 if test_pass:
                     logger.info(status)
-                    success[test_name] = pass_str
+                    success[test_name] = _PASS_STR
                 else:
                     logger.error(status)
                     logger.error('  see: case_outputs/{}.log'.format(
                         test_name))
-                    success[test_name] = fail_str
+                    success[test_name] = _FAIL_STR
                     failures += 1
 
-                test_times[test_name] = time.time() - test_start
+                test_times[test_name] = time.monotonic() - test_start
 
-        suite_time = time.time() - suite_start
+        suite_time = time.monotonic() - suite_start
 
         os.chdir(cwd)
 
-        logger.info('Test Runtimes:')
+        # log the runtimes all at once
+        lines = ['Test Runtimes:']
         for test_name, test_time in test_times.items():
-            secs = round(test_time)
-            mins = secs // 60
-            secs -= 60 * mins
-            logger.info('{:02d}:{:02d} {} {}'.format(
+            mins, secs = divmod(round(test_time), 60)
+            lines.append('{:02d}:{:02d} {} {}'.format(
                 mins, secs, success[test_name], test_name))
-        secs = round(suite_time)
-        mins = secs // 60
-        secs -= 60 * mins
-        logger.info('Total runtime {:02d}:{:02d}'.format(mins, secs))
+        mins, secs = divmod(round(suite_time), 60)
+        lines.append('Total runtime {:02d}:{:02d}'.format(mins, secs))
+        logger.info('\n'.join(lines))
 
         if failures == 0:
             logger.info('PASS: All passed successfully!')
@@ -184,16 +178,11 @@ def run_test_case(steps_to_run=None, steps_not_to_run=None):
         the defaults
     """
     with open('test_case.pickle', 'rb') as handle:
-        test_case = pickle.load(handle)
+        test_case = pickle.loads(handle.read())
 
-    config = configparser.ConfigParser(
-        interpolation=configparser.ExtendedInterpolation())
-    config.read(test_case.config_filename)
+    config = _read_config(test_case.config_filename)
     test_case.config = config
 
-    mpas_tools.io.default_format = config.get('io', 'format')
-    mpas_tools.io.default_engine = config.get('io', 'engine')
-
     if steps_to_run is None:
         steps_to_run = config.get('test_case',
                                   'steps_to_run').replace(',', ' ').split()
@@ -212,6 +201,7 @@ def run_test_case(steps_to_run=None, steps_not_to_run=None):
                     'steps in this test case:'
                     '\n{}'.format(step, list(test_case.steps)))
 
+        steps_not_to_run = set(steps_not_to_run)
         steps_to_run = [step for step in steps_to_run if step not in
                         steps_not_to_run]
 
@@ -233,18 +223,13 @@ def run_step():
     step's work directory
     """
     with open('step.pickle', 'rb') as handle:
-        test_case, step = pickle.load(handle)
+        test_case, step = pickle.loads(handle.read())
     test_case.steps_to_run = [step.name]
     test_case.new_step_log_file = False
 
-    config = configparser.ConfigParser(
-        interpolation=configparser.ExtendedInterpolation())
-    config.read(step.config_filename)
+    config = _read_config(step.config_filename)
     test_case.config = config
 
-    mpas_tools.io.default_format = config.get('io', 'format')
-    mpas_tools.io.default_engine = config.get('io', 'engine')
-
     # start logging to stdout/stderr
     test_name = step.path.replace('/', '_')
     with LoggingContext(name=test_name) as logger:
@@ -273,7 +258,8 @@ def main():
     elif os.path.exists('step.pickle'):
         run_step()
     else:
-        pickles = glob.glob('*.pickle')
+        pickles = [entry.name for entry in os.scandir('.') if
+                   entry.name.endswith('.pickle') and entry.is_file()]
         if len(pickles) == 1:
             suite = os.path.splitext(os.path.basename(pickles[0]))[0]
             run_suite(suite)
@@ -283,3 +269,28 @@ def main():
         else:
             raise ValueError('More than one suite was found. Please specify '
                              'which to run: compass run <suite>')
+
+
+def _read_config(config_filename):
+    """
+    Read the config options for a test case or step and use them to set the
+    default netCDF format and engine
+
+    Parameters
+    ----------
+    config_filename : str
+        The name of the config file in the current work directory
+
+    Returns
+    -------
+    config : configparser.ConfigParser
+        Configuration options for the test case
+    """
+    config = configparser.ConfigParser(
+        interpolation=configparser.ExtendedInterpolation())
+    config.read(config_filename)
+
+    mpas_tools.io.default_format = config.get('io', 'format')
+    mpas_tools.io.default_engine = config.get('io', 'engine')
+
+    return config
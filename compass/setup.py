@@ -224,6 +224,12 @@ def setup_case(path, test_case, config_file, machine, work_dir, baseline_dir,
         # process input, output, namelist and streams files
         step.process_inputs_and_outputs()
 
+    # the config options are read back in from the config file at runtime, so
+    # there's no need to pickle a copy with the test case and each step
+    test_case.config = None
+    for step in test_case.steps.values():
+        step.config = None
+
     # wait until we've set up all the steps before pickling because steps may
     # need other steps to be set up
     for step in test_case.steps.values():
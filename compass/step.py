@@ -3,7 +3,7 @@ from lxml import etree
 import configparser
 from importlib.resources import path
 import shutil
-import numpy
+from copy import deepcopy
 
 from compass.io import download, symlink
 import compass.namelist
@@ -392,7 +392,7 @@ class Step:
 
         # update PIO tasks based on the machine settings and the available
         # number or cores
-        pio_num_iotasks = int(numpy.ceil(cores / cores_per_node))
+        pio_num_iotasks = -(-cores // cores_per_node)
         pio_stride = cores // pio_num_iotasks
         if pio_stride > cores_per_node:
             raise ValueError('Not enough nodes for the number of cores.  '
@@ -537,6 +537,12 @@ class Step:
         step_work_dir = self.work_dir
         config = self.config
 
+        # steps that write several namelists (e.g. for restart runs) often
+        # use the same defaults and replacements file for each, so only parse
+        # them once
+        parsed_files = dict()
+        defaults = dict()
+
         for out_name in self.namelist_data:
 
             replacements = dict()
@@ -552,14 +558,24 @@ class Step:
                     # this is a dictionary of replacement namelist options
                     options = entry['options']
                 else:
-                    options = compass.namelist.parse_replacements(
-                        entry['package'], entry['namelist'])
+                    key = (entry['package'], entry['namelist'])
+                    if key not in parsed_files:
+                        parsed_files[key] = \
+                            compass.namelist.parse_replacements(*key)
+                    options = parsed_files[key]
                 replacements.update(options)
 
             defaults_filename = config.get('namelists', mode)
             out_filename = '{}/{}'.format(step_work_dir, out_name)
 
-            namelist = compass.namelist.ingest(defaults_filename)
+            if defaults_filename not in defaults:
+                defaults[defaults_filename] = \
+                    compass.namelist.ingest(defaults_filename)
+
+            # replacing options modifies the options within each record, so
+            # work on a copy of the records (much cheaper than a deep copy)
+            namelist = {record: dict(options) for record, options in
+                        defaults[defaults_filename].items()}
 
             namelist = compass.namelist.replace(namelist, replacements)
 
@@ -574,6 +590,10 @@ class Step:
         step_work_dir = self.work_dir
         config = self.config
 
+        # only parse each defaults file once, even if several streams files
+        # are generated from it
+        parsed_defaults = dict()
+
         for out_name in self.streams_data:
 
             # generate the streams file
@@ -595,7 +615,12 @@ class Step:
             defaults_filename = config.get('streams', mode)
             out_filename = '{}/{}'.format(step_work_dir, out_name)
 
-            defaults_tree = etree.parse(defaults_filename)
+            if defaults_filename not in parsed_defaults:
+                parsed_defaults[defaults_filename] = \
+                    etree.parse(defaults_filename)
+
+            # updating the defaults modifies the tree, so work on a copy
+            defaults_tree = deepcopy(parsed_defaults[defaults_filename])
 
             defaults = next(defaults_tree.iter('streams'))
             streams = next(tree.iter('streams'))
@@ -143,6 +143,8 @@ class TestCase:
         """
         logger = self.logger
         cwd = os.getcwd()
+        # the resources available don't change from one step to the next
+        available_cores, _ = get_available_cores_and_nodes(self.config)
         for step_name in self.steps_to_run:
             step = self.steps[step_name]
             step.config = self.config
@@ -160,17 +162,18 @@ class TestCase:
             if do_local_logging:
                 logger.info(' * Running {}'.format(step_name))
             try:
-                self._run_step(step, new_log_file)
+                self._run_step(step, new_log_file, available_cores)
             except BaseException:
                 if do_local_logging:
                     logger.info('     Failed')
                 raise
+            finally:
+                # return to the test case's directory even if the step failed
+                os.chdir(cwd)
 
             if do_local_logging:
                 logger.info('     Complete')
 
-            os.chdir(cwd)
-
     def validate(self):
         """
         Test cases can override this method to perform validation of variables
@@ -193,7 +196,8 @@ class TestCase:
             would need to run this step manually.
         """
         self.steps[step.name] = step
-        if run_by_default:
+        # don't run a step twice if it gets added again with the same name
+        if run_by_default and step.name not in self.steps_to_run:
             self.steps_to_run.append(step.name)
 
     def check_validation(self):
@@ -218,10 +222,10 @@ class TestCase:
                              'baseline.')
                 both_pass = False
 
-            if both_pass:
+            if not both_pass:
                 raise ValueError('Comparison failed, see above.')
 
-    def _run_step(self, step, new_log_file):
+    def _run_step(self, step, new_log_file, available_cores):
         """
         Run the requested step
 
@@ -232,11 +236,12 @@ class TestCase:
 
         new_log_file : bool
             Whether to log to a new log file
+
+        available_cores : int
+            The number of cores available for running steps
         """
         logger = self.logger
-        config = self.config
         cwd = os.getcwd()
-        available_cores, _ = get_available_cores_and_nodes(config)
         step.cores = min(step.cores, available_cores)
         if step.min_cores is not None:
             if step.cores < step.min_cores:
@@ -257,7 +262,7 @@ class TestCase:
 
         test_name = step.path.replace('/', '_')
         if new_log_file:
-            log_filename = '{}/{}.log'.format(cwd, step.name)
+            log_filename = os.path.join(cwd, '{}.log'.format(step.name))
             step.log_filename = log_filename
             step_logger = None
         else:
@@ -0,0 +1,90 @@
+import os
+
+import numpy
+import pytest
+import xarray
+
+pytest.importorskip('mpas_tools')
+
+import compass.model  # noqa: E402
+from compass.model import make_graph_file  # noqa: E402
+
+
+def _write_ring_mesh(filename, nCells=10):
+    """
+    Write a minimal mesh in which each cell neighbors the previous and next
+    cells in a ring, with a third, invalid neighbor entry
+    """
+    cells = numpy.arange(nCells)
+    cellsOnCell = numpy.zeros((nCells, 3), dtype=int)
+    cellsOnCell[:, 0] = (cells - 1) % nCells + 1
+    cellsOnCell[:, 1] = (cells + 1) % nCells + 1
+    nEdgesOnCell = 2*numpy.ones(nCells, dtype=int)
+    ds = xarray.Dataset()
+    ds['cellsOnCell'] = (('nCells', 'maxEdges'), cellsOnCell)
+    ds['nEdgesOnCell'] = (('nCells',), nEdgesOnCell)
+    ds.to_netcdf(filename)
+
+
+def _read(filename):
+    with open(filename) as f:
+        return f.read()
+
+
+def test_make_graph_file(tmp_path):
+    mesh_filename = str(tmp_path / 'mesh.nc')
+    graph_filename = str(tmp_path / 'graph.info')
+    _write_ring_mesh(mesh_filename, nCells=4)
+
+    make_graph_file(mesh_filename, graph_filename)
+
+    assert _read(graph_filename) == '4 4\n4 2\n1 3\n2 4\n3 1\n'
+
+
+def test_make_graph_file_remakes_truncated_file(tmp_path):
+    mesh_filename = str(tmp_path / 'mesh.nc')
+    graph_filename = str(tmp_path / 'graph.info')
+    _write_ring_mesh(mesh_filename)
+
+    make_graph_file(mesh_filename, graph_filename)
+    expected = _read(graph_filename)
+
+    # keep the header and part of the first few lines
+    with open(graph_filename, 'w') as f:
+        f.write(expected[:20])
+
+    make_graph_file(mesh_filename, graph_filename)
+
+    assert _read(graph_filename) == expected
+
+
+def test_make_graph_file_interrupted_leaves_no_partial_file(tmp_path,
+                                                             monkeypatch):
+    mesh_filename = str(tmp_path / 'mesh.nc')
+    graph_filename = str(tmp_path / 'graph.info')
+    nCells = 10
+    chunk_size = 2
+    _write_ring_mesh(mesh_filename, nCells=nCells)
+
+    get_cell_neighbors = compass.model._get_cell_neighbors
+    calls = list()
+
+    def interrupted(ds, chunk):
+        # fail partway through the second pass, after the header and the
+        # first chunk have been written
+        calls.append(chunk)
+        if len(calls) == nCells // chunk_size + 2:
+            raise KeyboardInterrupt()
+        return get_cell_neighbors(ds, chunk)
+
+    monkeypatch.setattr(compass.model, '_get_cell_neighbors', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        make_graph_file(mesh_filename, graph_filename, chunk_size=chunk_size)
+    monkeypatch.undo()
+
+    assert not os.path.exists(graph_filename)
+
+    make_graph_file(mesh_filename, graph_filename, chunk_size=chunk_size)
+    lines = _read(graph_filename).split('\n')
+    assert lines[0] == '{} {}'.format(nCells, nCells)
+    assert len(lines) == nCells + 2